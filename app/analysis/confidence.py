@@ -7,7 +7,7 @@ action recommendations, and sample size requirements for statistical significanc
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from enum import Enum
 from typing import Optional
 
@@ -41,10 +41,17 @@ class ConfidenceThresholds:
     cpl_target: float = 30.0
     cpl_acceptable: float = 45.0
 
+    def as_tuple(self) -> tuple:
+        """Field values in declaration order; `ConfidenceThresholds(*t.as_tuple())` round-trips."""
+        return astuple(self)
+
 
 # Default thresholds
 DEFAULT_THRESHOLDS = ConfidenceThresholds()
 
+# dtype of the `action` column added by add_confidence_columns
+ACTION_DTYPE = pd.CategoricalDtype(list(ActionRecommendation), ordered=True)
+
 
 def compute_confidence_level(
     spend: float,
@@ -181,8 +188,10 @@ def add_confidence_columns(
         cpl = row.get("cpl")
         return compute_action_recommendation(conf, cpl, thresholds)
     
-    result["action"] = result.apply(_compute_action, axis=1)
-    result["action_display"] = result["action"].apply(action_to_display)
+    # Ordered categorical (declaration order: SCALE first) so callers sort and count
+    # on the integer codes rather than on enum objects
+    result["action"] = pd.Categorical(result.apply(_compute_action, axis=1), dtype=ACTION_DTYPE)
+    result["action_display"] = result["action"].map(action_to_display).astype(object)
     
     # Compute sample size requirements
     def _compute_sample_req(row):
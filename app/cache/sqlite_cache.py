@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import hashlib
+import pickle
 import sqlite3
 import time
+from contextlib import closing
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+import pandas as pd
+
+
+# Databases whose schema has already been ensured in this process, so cache hits
+# don't pay for mkdir + DDL + commit on every lookup.
+_SCHEMA_READY: set[str] = set()
 
 
 def sha256_key(value: str) -> str:
@@ -17,8 +26,11 @@ class SqliteCache:
     db_path: Path
 
     def _connect(self) -> sqlite3.Connection:
+        path = str(self.db_path)
+        if path in _SCHEMA_READY and self.db_path.exists():
+            return sqlite3.connect(path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(self.db_path))
+        conn = sqlite3.connect(path)
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS cache (
@@ -30,12 +42,13 @@ class SqliteCache:
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_created ON cache(created_at)")
         conn.commit()
+        _SCHEMA_READY.add(path)
         return conn
 
-    def get(self, key: str, *, ttl_seconds: int) -> Optional[str]:
+    def _get_value(self, key: str, *, ttl_seconds: int) -> Optional[Any]:
         now = int(time.time())
         cutoff = now - max(int(ttl_seconds), 0)
-        with self._connect() as conn:
+        with closing(self._connect()) as conn:
             row = conn.execute("SELECT v, created_at FROM cache WHERE k = ?", (key,)).fetchone()
             if not row:
                 return None
@@ -44,21 +57,45 @@ class SqliteCache:
                 conn.execute("DELETE FROM cache WHERE k = ?", (key,))
                 conn.commit()
                 return None
-            return str(v)
+            return v
 
-    def set(self, key: str, value: str) -> None:
+    def _set_value(self, key: str, value: Any) -> None:
         now = int(time.time())
-        with self._connect() as conn:
+        with closing(self._connect()) as conn:
             conn.execute(
                 "INSERT OR REPLACE INTO cache(k, v, created_at) VALUES(?, ?, ?)",
                 (key, value, now),
             )
             conn.commit()
 
+    def get(self, key: str, *, ttl_seconds: int) -> Optional[str]:
+        v = self._get_value(key, ttl_seconds=ttl_seconds)
+        return None if v is None else str(v)
+
+    def set(self, key: str, value: str) -> None:
+        self._set_value(key, value)
+
+    def get_frame(self, key: str, *, ttl_seconds: int) -> Optional[pd.DataFrame]:
+        """
+        Return a cached DataFrame, or None if missing, expired, or stored in an older format.
+        Frames are pickled (dtypes preserved), so only use this for locally produced data.
+        """
+        v = self._get_value(key, ttl_seconds=ttl_seconds)
+        if not isinstance(v, bytes):
+            return None
+        try:
+            df = pickle.loads(v)
+        except Exception:
+            return None
+        return df if isinstance(df, pd.DataFrame) else None
+
+    def set_frame(self, key: str, df: pd.DataFrame) -> None:
+        self._set_value(key, sqlite3.Binary(pickle.dumps(df, protocol=5)))
+
     def prune(self, *, max_age_seconds: int) -> int:
         now = int(time.time())
         cutoff = now - max(int(max_age_seconds), 0)
-        with self._connect() as conn:
+        with closing(self._connect()) as conn:
             cur = conn.execute("DELETE FROM cache WHERE created_at < ?", (cutoff,))
             conn.commit()
             return int(cur.rowcount or 0)
@@ -22,7 +22,7 @@ from app.export.csv_export import dataframe_to_csv_bytes
 from app.export.google_sheets import GoogleSheetsConfig, push_dataframe_to_sheet
 from app.meta.client import MetaGraphClient, MetaApiError
 from app.meta.insights import InsightsQuery, fetch_action_type_summary_cached, fetch_insights_frame_cached
-from app.meta.objects import MetaObject, list_ads, list_adsets, list_campaigns
+from app.meta.objects import MetaObject, clear_meta_cache, list_campaign_adset_ad_bundle, list_campaigns
 from app.leadspedia.client import LeadspediaClient, LeadspediaApiError
 from app.leadspedia.matching import fetch_and_match_data_cached
 from app.metrics.revenue import (
@@ -141,9 +141,10 @@ def main() -> None:
 
     if load_objects:
         try:
-            st.session_state["campaigns"] = list_campaigns(client, cfg.meta_ad_account_id)
-            st.session_state["adsets"] = list_adsets(client, cfg.meta_ad_account_id)
-            st.session_state["ads"] = list_ads(client, cfg.meta_ad_account_id)
+            bundle = list_campaign_adset_ad_bundle(client, cfg.meta_ad_account_id)
+            st.session_state["campaigns"] = bundle["campaigns"]
+            st.session_state["adsets"] = bundle["adsets"]
+            st.session_state["ads"] = bundle["ads"]
         except MetaApiError as e:
             st.error(str(e))
 
@@ -259,6 +260,7 @@ def main() -> None:
             
             # Refresh campaign data
             if st.button("Refresh Campaigns", key="refresh_campaigns_meta"):
+                clear_meta_cache()
                 try:
                     all_campaigns = list_campaigns(client, cfg.meta_ad_account_id)
                     st.session_state["campaigns"] = all_campaigns
@@ -983,19 +983,16 @@ def fetch_leads_cached(
     }
     cache_key = sha256_key(json.dumps(key_material, sort_keys=True, separators=(",", ":")))
 
-    cached = cache.get(cache_key, ttl_seconds=ttl_seconds)
-    if cached:
-        try:
-            return pd.read_json(cached, orient="records")
-        except Exception:
-            pass
+    cached = cache.get_frame(cache_key, ttl_seconds=ttl_seconds)
+    if cached is not None:
+        return cached
 
     rows = fetch_leads(client, query)
     dispositions = parse_leads_to_dispositions(rows)
     df = leads_to_dataframe(dispositions)
     
     if not df.empty:
-        cache.set(cache_key, df.to_json(orient="records", date_format="iso"))
+        cache.set_frame(cache_key, df)
     
     return df
 
@@ -7,12 +7,16 @@ lead dispositions, enabling combined KPI calculations.
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import logging
+from dataclasses import dataclass, fields
 from datetime import date
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Sequence
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from app.cache.sqlite_cache import SqliteCache, sha256_key
@@ -28,8 +32,9 @@ from app.leadspedia.leads import (
     aggregate_lead_stats,
 )
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class MatchedLeadData:
     """Combined data from Meta and Leadspedia for matched leads."""
     
@@ -68,7 +73,7 @@ class MatchedLeadData:
     break_even_cpl: float  # avg_sale_price * (sell_through_rate / 100)
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     """Result of matching Meta and Leadspedia data."""
     
@@ -139,47 +144,106 @@ def match_meta_to_leadspedia(
             match_rate=0.0,
         )
 
-    matched_data: List[MatchedLeadData] = []
-    unmatched_campaigns: List[str] = []
-    
+    # Resolve campaign mappings once per distinct campaign rather than per row
+    campaign_ids = _text_column(meta_df, "campaign_id")
+    mapping_by_id: Dict[str, Optional[CampaignMapping]] = {
+        cid: cfg.get_campaign_mapping(cid) for cid in campaign_ids.unique()
+    }
+    unmatched_campaigns = [cid for cid, m in mapping_by_id.items() if m is None]
+
     # Aggregate LP stats ONCE for all dispositions
     # This will be distributed proportionally across all Meta rows
     global_lp_stats = _aggregate_lp_dispositions(lp_dispositions)
-    
+
+    # Meta columns as NumPy arrays
+    spend = _numeric_column(meta_df, "spend")
+    meta_leads = _numeric_column(meta_df, "leads").astype(np.int64)
+    impressions = _numeric_column(meta_df, "impressions").astype(np.int64)
+    clicks = _numeric_column(meta_df, "clicks").astype(np.int64)
+    cpl = _numeric_column(meta_df, "cpl", fill=None)
+
     # Calculate total Meta leads across ALL campaigns for global proportional distribution
-    total_global_meta_leads = int(meta_df["leads"].sum()) if "leads" in meta_df.columns else 0
-    
-    
-    # Process each row in the Meta dataframe
-    # Distribute LP data proportionally based on each row's share of GLOBAL Meta leads
-    for _, row in meta_df.iterrows():
-        campaign_id = str(row.get("campaign_id", ""))
-        meta_leads_for_row = int(row.get("leads", 0) or 0)
-        
-        # Calculate this row's proportion of the GLOBAL total leads
-        if total_global_meta_leads > 0 and meta_leads_for_row > 0:
-            proportion = meta_leads_for_row / total_global_meta_leads
-        else:
-            proportion = 0.0
-        
-        # Get mapping if available (for future use)
-        mapping: Optional[CampaignMapping] = cfg.get_campaign_mapping(campaign_id)
-        if not mapping:
-            unmatched_campaigns.append(campaign_id)
-        
-        matched = _create_matched_data_proportional(row, global_lp_stats, proportion, mapping)
-        if matched:
-            matched_data.append(matched)
+    total_global_meta_leads = int(meta_leads.sum())
 
-    meta_lead_count = int(meta_df["leads"].sum()) if "leads" in meta_df.columns else 0
+    # Each row's proportion of the GLOBAL total leads
+    proportions = np.zeros(len(meta_df))
+    if total_global_meta_leads > 0:
+        np.divide(meta_leads, total_global_meta_leads, out=proportions, where=meta_leads > 0)
+
+    # Distribute LP totals across all rows in one broadcast:
+    # columns are total, sold, rejected, pending, revenue, payout
+    stats_vec = np.array(
+        [
+            global_lp_stats["total"],
+            global_lp_stats["sold"],
+            global_lp_stats["rejected"],
+            global_lp_stats["pending"],
+            global_lp_stats["revenue"],
+            global_lp_stats["payout"],
+        ],
+        dtype=np.float64,
+    )
+    distributed = proportions[:, None] * stats_vec[None, :]
+    lp_total, lp_sold, lp_rejected, lp_pending = np.rint(distributed[:, :4]).astype(np.int64).T
+    lp_revenue = distributed[:, 4]
+    lp_payout = distributed[:, 5]
+    lp_net_revenue = lp_revenue - lp_payout
+
+    # Calculate KPIs
+    sell_through_rate = _safe_divide(lp_sold, lp_total) * 100
+    avg_sale_price = _safe_divide(lp_revenue, lp_sold)
+    roi = _safe_divide(lp_revenue - spend, spend) * 100
+    profit = lp_revenue - spend
+    profit_per_lead = _safe_divide(profit, meta_leads)
+    epc = _safe_divide(lp_revenue, clicks)
+    epl = _safe_divide(lp_revenue, meta_leads)
+    break_even_cpl = np.where(avg_sale_price > 0, avg_sale_price * (sell_through_rate / 100), 0.0)
+
+    # Get LP campaign info from stats
+    lp_campaign_name = str(global_lp_stats.get("campaign_name", ""))
+    lp_campaign_id = str(global_lp_stats.get("campaign_id", ""))
+
+    columns: Dict[str, Iterable[Any]] = {
+        "campaign_id": campaign_ids.tolist(),
+        "campaign_name": _text_column(meta_df, "campaign_name").tolist(),
+        "adset_id": _text_column(meta_df, "adset_id").tolist(),
+        "adset_name": _text_column(meta_df, "adset_name").tolist(),
+        "ad_id": _text_column(meta_df, "ad_id").tolist(),
+        "ad_name": _text_column(meta_df, "ad_name").tolist(),
+        "spend": spend.tolist(),
+        "meta_leads": meta_leads.tolist(),
+        "impressions": impressions.tolist(),
+        "clicks": clicks.tolist(),
+        "cpl": cpl.tolist(),
+        "lp_campaign_id": repeat(lp_campaign_id),
+        "lp_campaign_name": repeat(lp_campaign_name),
+        "lp_total_leads": lp_total.tolist(),
+        "lp_sold_leads": lp_sold.tolist(),
+        "lp_rejected_leads": lp_rejected.tolist(),
+        "lp_pending_leads": lp_pending.tolist(),
+        "lp_revenue": lp_revenue.tolist(),
+        "lp_payout": lp_payout.tolist(),
+        "lp_net_revenue": lp_net_revenue.tolist(),
+        "sell_through_rate": sell_through_rate.tolist(),
+        "avg_sale_price": avg_sale_price.tolist(),
+        "roi": roi.tolist(),
+        "profit": profit.tolist(),
+        "profit_per_lead": profit_per_lead.tolist(),
+        "epc": epc.tolist(),
+        "epl": epl.tolist(),
+        "break_even_cpl": break_even_cpl.tolist(),
+    }
+    matched_data = [
+        MatchedLeadData(*values)
+        for values in zip(*(columns[f.name] for f in fields(MatchedLeadData)))
+    ]
+
+    meta_lead_count = total_global_meta_leads
     lp_lead_count = len(lp_dispositions)
-    
+
     # Calculate match rate based on leads that have corresponding Leadspedia data
-    matched_lp_count = sum(m.lp_total_leads for m in matched_data)
-    matched_sold_count = sum(m.lp_sold_leads for m in matched_data)
-    matched_revenue = sum(m.lp_revenue for m in matched_data)
+    matched_lp_count = int(lp_total.sum())
     match_rate = (matched_lp_count / meta_lead_count * 100) if meta_lead_count > 0 else 0.0
-    
 
     return MatchResult(
         matched_data=matched_data,
@@ -190,91 +254,28 @@ def match_meta_to_leadspedia(
     )
 
 
-def _create_matched_data_proportional(
-    meta_row: pd.Series,
-    lp_stats: Dict[str, Any],
-    proportion: float,
-    mapping: CampaignMapping,
-) -> Optional[MatchedLeadData]:
-    """
-    Create matched data from a Meta row with proportionally distributed LP data.
-    
-    This distributes the campaign's LP totals proportionally to each ad based on
-    the ad's share of the campaign's total Meta leads.
-    
-    Args:
-        meta_row: Row from Meta DataFrame
-        lp_stats: Pre-aggregated LP statistics for the campaign
-        proportion: This row's proportion of the campaign total (0.0 to 1.0)
-        mapping: Campaign mapping configuration
-    """
-    # Extract Meta data
-    campaign_id = str(meta_row.get("campaign_id", ""))
-    campaign_name = str(meta_row.get("campaign_name", ""))
-    adset_id = str(meta_row.get("adset_id", ""))
-    adset_name = str(meta_row.get("adset_name", ""))
-    ad_id = str(meta_row.get("ad_id", ""))
-    ad_name = str(meta_row.get("ad_name", ""))
-    
-    spend = float(meta_row.get("spend", 0) or 0)
-    meta_leads = int(meta_row.get("leads", 0) or 0)
-    impressions = int(meta_row.get("impressions", 0) or 0)
-    clicks = int(meta_row.get("clicks", 0) or 0)
-    cpl = float(meta_row.get("cpl", 0) or 0)
-    
-    # Distribute LP data proportionally based on this row's share of campaign leads
-    lp_total = int(round(lp_stats["total"] * proportion))
-    lp_sold = int(round(lp_stats["sold"] * proportion))
-    lp_rejected = int(round(lp_stats["rejected"] * proportion))
-    lp_pending = int(round(lp_stats["pending"] * proportion))
-    lp_revenue = lp_stats["revenue"] * proportion
-    lp_payout = lp_stats["payout"] * proportion
-    lp_net_revenue = lp_revenue - lp_payout
-    
-    # Calculate KPIs
-    sell_through_rate = (lp_sold / lp_total * 100) if lp_total > 0 else 0.0
-    avg_sale_price = lp_revenue / lp_sold if lp_sold > 0 else 0.0
-    roi = ((lp_revenue - spend) / spend * 100) if spend > 0 else 0.0
-    profit = lp_revenue - spend
-    profit_per_lead = profit / meta_leads if meta_leads > 0 else 0.0
-    epc = lp_revenue / clicks if clicks > 0 else 0.0
-    epl = lp_revenue / meta_leads if meta_leads > 0 else 0.0
-    break_even_cpl = avg_sale_price * (sell_through_rate / 100) if avg_sale_price > 0 else 0.0
-    
-    # Get LP campaign info from stats
-    lp_campaign_name = str(lp_stats.get("campaign_name", ""))
-    lp_campaign_id = str(lp_stats.get("campaign_id", ""))
-    
-    return MatchedLeadData(
-        campaign_id=campaign_id,
-        campaign_name=campaign_name,
-        adset_id=adset_id,
-        adset_name=adset_name,
-        ad_id=ad_id,
-        ad_name=ad_name,
-        spend=spend,
-        meta_leads=meta_leads,
-        impressions=impressions,
-        clicks=clicks,
-        cpl=cpl,
-        lp_campaign_id=lp_campaign_id,
-        lp_campaign_name=lp_campaign_name,
-        lp_total_leads=lp_total,
-        lp_sold_leads=lp_sold,
-        lp_rejected_leads=lp_rejected,
-        lp_pending_leads=lp_pending,
-        lp_revenue=lp_revenue,
-        lp_payout=lp_payout,
-        lp_net_revenue=lp_net_revenue,
-        sell_through_rate=sell_through_rate,
-        avg_sale_price=avg_sale_price,
-        roi=roi,
-        profit=profit,
-        profit_per_lead=profit_per_lead,
-        epc=epc,
-        epl=epl,
-        break_even_cpl=break_even_cpl,
-    )
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column as strings, or empty strings if the column is missing."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[col].astype(str)
+
+
+def _numeric_column(df: pd.DataFrame, col: str, *, fill: Optional[float] = 0.0) -> np.ndarray:
+    """Column as a float64 array; missing/unparseable values become `fill` (NaN if None)."""
+    if col not in df.columns:
+        return np.full(len(df), np.nan if fill is None else fill)
+    values = pd.to_numeric(df[col], errors="coerce")
+    if fill is not None:
+        values = values.fillna(fill)
+    return values.to_numpy(dtype=np.float64)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division that yields 0.0 where the denominator is not positive."""
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
 
 
 def _aggregate_lp_dispositions(
@@ -320,6 +321,17 @@ def _aggregate_lp_dispositions(
     }
 
 
+_COUNT_COLUMNS = (
+    "meta_leads",
+    "impressions",
+    "clicks",
+    "lp_total_leads",
+    "lp_sold_leads",
+    "lp_rejected_leads",
+    "lp_pending_leads",
+)
+
+
 def matched_data_to_dataframe(
     matched: List[MatchedLeadData],
 ) -> pd.DataFrame:
@@ -360,7 +372,16 @@ def matched_data_to_dataframe(
             "break_even_cpl": m.break_even_cpl,
         })
     
-    return pd.DataFrame(records)
+    # Keep count columns integral end to end so KPI sums never round-trip through float
+    return pd.DataFrame(records).astype({col: "int64" for col in _COUNT_COLUMNS})
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """Deterministic content hash of a DataFrame (stable across processes, unlike hash())."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    # uint64 sum wraps modulo 2**64, folding the row hashes into a single 64-bit value
+    digest = int(row_hashes.sum())
+    return f"{digest:016x}:{len(df)}:{','.join(map(str, df.columns))}"
 
 
 def fetch_and_match_data_cached(
@@ -405,24 +426,22 @@ def fetch_and_match_data_cached(
     # Build cache key
     config_hash = ""
     if campaign_config:
-        config_hash = str(hash(json.dumps(campaign_config.to_dict(), sort_keys=True)))
+        config_json = json.dumps(campaign_config.to_dict(), sort_keys=True, separators=(",", ":"))
+        config_hash = hashlib.blake2b(config_json.encode("utf-8"), digest_size=8).hexdigest()
     
     key_material = {
         "source": "matched_data_v2",
         "since": since.isoformat(),
         "until": until.isoformat(),
-        "meta_hash": str(hash(meta_df.to_json())) if not meta_df.empty else "empty",
+        "meta_hash": _frame_fingerprint(meta_df) if not meta_df.empty else "empty",
         "affiliate_id": affiliate_id or "",
         "config_hash": config_hash,
     }
     cache_key = sha256_key(json.dumps(key_material, sort_keys=True, separators=(",", ":")))
     
-    cached = cache.get(cache_key, ttl_seconds=ttl_seconds)
-    if cached:
-        try:
-            return pd.read_json(cached, orient="records")
-        except Exception:
-            pass
+    cached = cache.get_frame(cache_key, ttl_seconds=ttl_seconds)
+    if cached is not None:
+        return cached
     
     # Fetch all Leadspedia data for the affiliate
     all_dispositions: List[LeadDisposition] = []
@@ -441,11 +460,17 @@ def fetch_and_match_data_cached(
             rows = list(fetch_leads(lp_client, query))
             if rows:
                 all_dispositions = parse_leads_to_dispositions(rows)
-                if all_dispositions:
-                    sold_count = sum(1 for d in all_dispositions if d.is_sold)
-                    total_revenue = sum(float(d.revenue) for d in all_dispositions)
+                if all_dispositions and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Fetched %d leads (%d sold, $%.2f revenue) for affiliate %s",
+                        len(all_dispositions),
+                        sum(1 for d in all_dispositions if d.is_sold),
+                        sum(float(d.revenue) for d in all_dispositions),
+                        affiliate_id,
+                    )
         except Exception:
-            pass  # Will try sold leads endpoint as fallback
+            # Will try sold leads endpoint as fallback
+            logger.debug("fetch_leads failed for affiliate %s", affiliate_id, exc_info=True)
         
         # Also try fetching sold leads specifically (may have more revenue data)
         try:
@@ -453,33 +478,33 @@ def fetch_and_match_data_cached(
             if sold_rows:
                 # Parse sold leads and merge/update dispositions
                 sold_dispositions = parse_leads_to_dispositions(sold_rows)
-                if sold_dispositions:
-                    d = sold_dispositions[0]
-                    sold_total_revenue = sum(float(d.revenue) for d in sold_dispositions)
+                if sold_dispositions and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Fetched %d sold leads ($%.2f revenue) for affiliate %s",
+                        len(sold_dispositions),
+                        sum(float(d.revenue) for d in sold_dispositions),
+                        affiliate_id,
+                    )
                 
                 # If we got sold leads but no all leads, use sold leads
                 if not all_dispositions and sold_dispositions:
                     all_dispositions = sold_dispositions
                 elif sold_dispositions:
-                    # Merge sold data - mark these as sold
-                    sold_ids = {d.lead_id for d in sold_dispositions}
-                    # Update existing dispositions with sold status
-                    for disp in all_dispositions:
-                        if disp.lead_id in sold_ids:
-                            # Find the sold disposition and get revenue
-                            for sold_disp in sold_dispositions:
-                                if sold_disp.lead_id == disp.lead_id:
-                                    # Update with sold data (sold has revenue info)
-                                    # Since LeadDisposition is a dataclass, we'll just add sold ones
-                                    break
+                    # Merge sold data: the sold endpoint carries revenue info, so its
+                    # record replaces the matching lead from the all-leads fetch
+                    sold_by_id = {d.lead_id: d for d in sold_dispositions}
+                    existing_ids = set()
+                    for i, disp in enumerate(all_dispositions):
+                        existing_ids.add(disp.lead_id)
+                        sold_disp = sold_by_id.get(disp.lead_id)
+                        if sold_disp is not None:
+                            all_dispositions[i] = sold_disp
                     # Add any sold leads not in all_dispositions
-                    existing_ids = {d.lead_id for d in all_dispositions}
-                    for sold_disp in sold_dispositions:
-                        if sold_disp.lead_id not in existing_ids:
-                            all_dispositions.append(sold_disp)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
+                    all_dispositions.extend(
+                        d for d in sold_dispositions if d.lead_id not in existing_ids
+                    )
+        except Exception:
+            logger.exception("Failed to fetch sold leads for affiliate %s", affiliate_id)
     
     # Also try legacy campaign map if no dispositions found
     if not all_dispositions and cfg.leadspedia_campaign_map:
@@ -503,7 +528,7 @@ def fetch_and_match_data_cached(
     
     # Cache the result
     if not df.empty:
-        cache.set(cache_key, df.to_json(orient="records"))
+        cache.set_frame(cache_key, df)
     
     return df
 
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Iterator, Optional
-from urllib.parse import urljoin
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urljoin
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
+try:
+    import orjson  # optional: faster parsing of large Graph API pages
+except ImportError:  # pragma: no cover - exercised when orjson isn't installed
+    orjson = None
+
 
 class MetaApiError(RuntimeError):
     def __init__(self, message: str, *, status_code: int | None = None, payload: dict | None = None):
@@ -36,6 +44,26 @@ def _encode_graph_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     return out
 
 
+def _api_error(status_code: int, payload: Any) -> MetaApiError:
+    msg = f"Meta API error HTTP {status_code}"
+    if isinstance(payload, dict) and "error" in payload:
+        err = payload.get("error") or {}
+        msg = f"Meta API error: {err.get('message','unknown')} (type={err.get('type')}, code={err.get('code')})"
+    return MetaApiError(msg, status_code=status_code, payload=payload if isinstance(payload, dict) else None)
+
+
+@lru_cache(maxsize=1)
+def _default_session() -> requests.Session:
+    """
+    Process-wide Session shared by clients that don't bring their own, so paginated
+    and repeated calls reuse pooled keep-alive connections instead of new TLS handshakes.
+    """
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    sess.mount("https://", adapter)
+    return sess
+
+
 @dataclass(frozen=True)
 class MetaGraphClient:
     api_version: str
@@ -48,20 +76,20 @@ class MetaGraphClient:
         return f"https://graph.facebook.com/{self.api_version.strip('/')}/"
 
     def _get_session(self) -> requests.Session:
-        return self.session or requests.Session()
+        return self.session or _default_session()
 
-    def _raise_for_meta_error(self, resp: Response) -> None:
+    def _parse_response(self, resp: Response) -> Dict[str, Any]:
+        """Decode the response body once, raising MetaApiError for error responses."""
         try:
-            payload = resp.json()
+            payload = _json_loads(resp.content)
         except Exception:
             payload = None
 
         if resp.status_code >= 400:
-            msg = f"Meta API error HTTP {resp.status_code}"
-            if isinstance(payload, dict) and "error" in payload:
-                err = payload.get("error") or {}
-                msg = f"Meta API error: {err.get('message','unknown')} (type={err.get('type')}, code={err.get('code')})"
-            raise MetaApiError(msg, status_code=resp.status_code, payload=payload if isinstance(payload, dict) else None)
+            raise _api_error(resp.status_code, payload)
+        if payload is None:
+            raise MetaApiError("Meta API returned a non-JSON response", status_code=resp.status_code)
+        return payload
 
     @retry(
         retry=retry_if_exception_type((requests.RequestException, MetaApiError)),
@@ -75,25 +103,78 @@ class MetaGraphClient:
         query["access_token"] = self.access_token
 
         resp = self._get_session().get(url, params=query, timeout=30)
-        self._raise_for_meta_error(resp)
-        return resp.json()
+        return self._parse_response(resp)
+
+    @retry(
+        retry=retry_if_exception_type((requests.RequestException, MetaApiError)),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(4),
+        reraise=True,
+    )
+    def get_batch(self, calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Run several GET requests in one Graph API batch call (max 50 per batch).
+
+        Returns the decoded body of each sub-request, in order. A failed
+        sub-request raises MetaApiError just like a failed `get`.
+        """
+        batch = [
+            {"method": "GET", "relative_url": f"{path.lstrip('/')}?{urlencode(_encode_graph_params(params))}"}
+            for path, params in calls
+        ]
+        resp = self._get_session().post(
+            self.base_url,
+            data={"batch": safe_json_dumps(batch), "include_headers": "false", "access_token": self.access_token},
+            timeout=60,
+        )
+        payload = self._parse_response(resp)
+        if not isinstance(payload, list) or len(payload) != len(calls):
+            raise MetaApiError("Meta API returned an unexpected batch response", status_code=resp.status_code)
+
+        bodies: List[Dict[str, Any]] = []
+        for item in payload:
+            code = (item or {}).get("code") or 500
+            try:
+                body = _json_loads((item or {}).get("body") or "null")
+            except Exception:
+                body = None
+            if code >= 400:
+                raise _api_error(code, body)
+            if not isinstance(body, dict):
+                raise MetaApiError("Meta API returned a non-JSON response", status_code=code)
+            bodies.append(body)
+        return bodies
+
+    def _get_next_page(self, sess: requests.Session, next_url: str) -> Dict[str, Any]:
+        resp = sess.get(next_url, timeout=30)
+        return self._parse_response(resp)
 
     def get_paged(self, path: str, *, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
         """
         Iterate through Graph API paging by following paging.next URLs.
         Returns each page payload (dict).
+
+        The next page is requested in the background before the current one is
+        yielded, so network latency overlaps with the consumer's processing.
         """
-        first = self.get(path, params=params)
-        yield first
+        yield from self.follow_paging(self.get(path, params=params))
 
-        next_url = (first.get("paging") or {}).get("next")
-        sess = self._get_session()
-        while next_url:
-            resp = sess.get(next_url, timeout=30)
-            self._raise_for_meta_error(resp)
-            payload = resp.json()
+    def follow_paging(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield an already-fetched page followed by every page after it."""
+        next_url = (payload.get("paging") or {}).get("next")
+        if not next_url:
             yield payload
-            next_url = (payload.get("paging") or {}).get("next")
+            return
+
+        sess = self._get_session()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            while True:
+                pending = pool.submit(self._get_next_page, sess, next_url) if next_url else None
+                yield payload
+                if pending is None:
+                    return
+                payload = pending.result()
+                next_url = (payload.get("paging") or {}).get("next")
 
 
 def iter_data_from_pages(pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
@@ -105,7 +186,15 @@ def iter_data_from_pages(pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str,
                     yield item
 
 
+def _json_loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 def safe_json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
     return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
 
 
@@ -5,10 +5,11 @@ from datetime import date
 import json
 from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from app.cache.sqlite_cache import SqliteCache, sha256_key
-from app.metrics.cpl import compute_cpl, count_leads_from_actions
+from app.metrics.cpl import action_column, action_values_by_type, count_leads_from_columns
 from app.meta.client import MetaGraphClient, iter_data_from_pages
 
 
@@ -69,62 +70,97 @@ def fetch_insights_rows(client: MetaGraphClient, query: InsightsQuery) -> Iterat
     yield from iter_data_from_pages(pages)
 
 
+# Output schema for insights frames. IDs are kept for matching with external
+# data sources (e.g., Leadspedia); breakdown columns only appear when requested.
+_ID_COLUMNS = ("campaign_id", "adset_id", "ad_id")
+_BREAKDOWN_COLUMNS = ("age", "gender", "publisher_platform", "platform_position", "device_platform")
+_BASE_COLUMNS = (
+    "campaign_name",
+    "adset_name",
+    "ad_name",
+    "spend",
+    "leads",
+    "cpl",
+    "impressions",
+    "clicks",
+    "ctr",
+    "cpc",
+    "frequency",
+    "reach",
+)
+_FRAME_COLUMNS = _ID_COLUMNS + _BREAKDOWN_COLUMNS + _BASE_COLUMNS
+_RAW_COLUMNS = tuple(c for c in _FRAME_COLUMNS if c not in ("leads", "cpl"))
+# The Graph API returns metrics as strings; coerce them once so downstream math
+# runs on float64/int64 buffers instead of object columns.
+_FLOAT_COLUMNS = ("spend", "ctr", "cpc", "frequency")
+_INT_COLUMNS = ("impressions", "clicks", "reach")
+
+
 def insights_rows_to_frame(
     rows: Iterable[Dict[str, Any]],
     *,
     lead_action_types: Sequence[str],
 ) -> pd.DataFrame:
-    normalized: List[Dict[str, Any]] = []
-    for r in rows:
-        spend = r.get("spend")
-        actions = r.get("actions")
-        leads = count_leads_from_actions(actions, lead_action_types=lead_action_types)
-        cpl = compute_cpl(spend, leads)
-
-        out = dict(r)
-        out["leads"] = leads
-        out["cpl"] = cpl
-        normalized.append(out)
+    """
+    Build the insights frame for a page of Graph API rows.
 
-    if not normalized:
+    The nested `actions` list of every row is pivoted once into one float column per
+    lead action type (`action_<type>`), so lead counts and any later per-type metric
+    are plain column operations rather than per-row walks over list-of-dicts.
+    """
+    columns: Dict[str, List[Any]] = {c: [] for c in _RAW_COLUMNS}
+    raw_columns = [(c, columns[c].append) for c in _RAW_COLUMNS]
+    lead_types = tuple(dict.fromkeys(lead_action_types))
+    lead_type_set = frozenset(lead_types)
+    action_values: Dict[str, List[float]] = {action_column(t): [] for t in lead_types}
+    action_columns = [(t, action_values[action_column(t)].append) for t in lead_types]
+    n_rows = 0
+    for r in rows:
+        n_rows += 1
+        totals = action_values_by_type(r.get("actions"), action_types=lead_type_set)
+        for t, append in action_columns:
+            append(totals.get(t, 0.0))
+        for col, append in raw_columns:
+            append(r.get(col))
+
+    if not n_rows:
         return pd.DataFrame()
 
-    df = pd.json_normalize(normalized)
-
-    # Keep a tidy subset of columns (breakdown columns may vary per query).
-    # Include IDs for matching with external data sources (e.g., Leadspedia)
-    id_cols = [
-        "campaign_id",
-        "adset_id",
-        "ad_id",
-    ]
-    base_cols = [
-        "campaign_name",
-        "adset_name",
-        "ad_name",
-        "spend",
-        "leads",
-        "cpl",
-        "impressions",
-        "clicks",
-        "ctr",
-        "cpc",
-        "frequency",
-        "reach",
-    ]
-    present_ids = [c for c in id_cols if c in df.columns]
-    present = [c for c in base_cols if c in df.columns]
-    # Include breakdown fields if present
-    breakdown_cols = [c for c in df.columns if c in ("age", "gender", "publisher_platform", "platform_position", "device_platform")]
-    cols = present_ids + breakdown_cols + present
-    return df[cols].copy()
+    # Drop Meta fields that were absent from every row (e.g. breakdowns not requested).
+    df = pd.DataFrame(
+        {col: values for col, values in columns.items() if any(v is not None for v in values)},
+        index=pd.RangeIndex(n_rows),
+    )
+    for col in _FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in _INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+    for col, values in action_values.items():
+        df[col] = np.asarray(values, dtype=np.float64)
+
+    # CPL for the whole page in one vectorized division; rows without leads
+    # (or without a parseable spend) keep a missing CPL, as compute_cpl does.
+    df["leads"] = count_leads_from_columns(df, lead_action_types=lead_types)
+    leads = df["leads"].to_numpy()
+    spend = df["spend"].to_numpy() if "spend" in df.columns else np.full(n_rows, np.nan)
+    cpl = np.full(n_rows, np.nan)
+    np.divide(spend, leads, out=cpl, where=(leads > 0) & ~np.isnan(spend))
+    df["cpl"] = cpl
+
+    return df[[c for c in _FRAME_COLUMNS if c in df.columns] + list(action_values)]
+
 
 def summarize_action_types(rows: Iterable[Dict[str, Any]]) -> pd.DataFrame:
     """
     Returns total action values by action_type across the provided rows.
     Useful to validate which action_type corresponds to Lead Ads submissions.
     """
-    totals: Dict[str, float] = {}
+    types: List[str] = []
+    values: List[Any] = []
+    append_type = types.append
+    append_value = values.append
     for r in rows:
         actions = r.get("actions")
         if not isinstance(actions, list):
@@ -133,18 +169,18 @@ def summarize_action_types(rows: Iterable[Dict[str, Any]]) -> pd.DataFrame:
             if not isinstance(a, dict):
                 continue
             t = a.get("action_type")
-            v = a.get("value")
             if not t:
                 continue
-            try:
-                fv = float(v)
-            except Exception:
-                continue
-            totals[t] = totals.get(t, 0.0) + fv
-    if not totals:
+            append_type(t)
+            append_value(a.get("value"))
+
+    # Parse and reduce in pandas; values that don't parse as numbers are skipped.
+    raw = pd.Series(values, index=pd.Index(types, name="action_type"), dtype=object)
+    parsed = pd.to_numeric(raw, errors="coerce").dropna()
+    if parsed.empty:
         return pd.DataFrame(columns=["action_type", "total_value"])
-    df = pd.DataFrame([{"action_type": k, "total_value": v} for k, v in totals.items()])
-    return df.sort_values(by="total_value", ascending=False).reset_index(drop=True)
+    totals = parsed.astype("float64").groupby(level=0, sort=False).sum()
+    return totals.sort_values(ascending=False).rename("total_value").reset_index()
 
 
 def fetch_insights_frame_cached(
@@ -172,17 +208,13 @@ def fetch_insights_frame_cached(
         "lead_action_types": list(lead_action_types),
     }
     cache_key = sha256_key(json.dumps(key_material, sort_keys=True, separators=(",", ":"), default=str))
-    cached = cache.get(cache_key, ttl_seconds=ttl_seconds)
-    if cached:
-        try:
-            return pd.read_json(cached, orient="records")
-        except Exception:
-            # Fall through to refresh if cache is corrupted/old schema.
-            pass
+    cached = cache.get_frame(cache_key, ttl_seconds=ttl_seconds)
+    if cached is not None:
+        return cached
 
     rows = fetch_insights_rows(client, query)
     df = insights_rows_to_frame(rows, lead_action_types=lead_action_types)
-    cache.set(cache_key, df.to_json(orient="records"))
+    cache.set_frame(cache_key, df)
     return df
 
 
@@ -207,16 +239,13 @@ def fetch_action_type_summary_cached(
         },
     }
     cache_key = sha256_key(json.dumps(key_material, sort_keys=True, separators=(",", ":"), default=str))
-    cached = cache.get(cache_key, ttl_seconds=ttl_seconds)
-    if cached:
-        try:
-            return pd.read_json(cached, orient="records")
-        except Exception:
-            pass
+    cached = cache.get_frame(cache_key, ttl_seconds=ttl_seconds)
+    if cached is not None:
+        return cached
 
     rows = fetch_insights_rows(client, query)
     df = summarize_action_types(rows)
-    cache.set(cache_key, df.to_json(orient="records"))
+    cache.set_frame(cache_key, df)
     return df
 
 
@@ -1,8 +1,23 @@
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.meta.client import MetaGraphClient, iter_data_from_pages
 
+# Object listings change rarely, but are requested on every dashboard refresh and
+# dropdown population; keep them for a few minutes per client/account/filter.
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_ENTRIES = 256
+_cache: Dict[Tuple[Any, ...], Tuple[float, List["MetaObject"]]] = {}
+_cache_lock = threading.Lock()
+
+_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "campaigns": ("id", "name", "effective_status"),
+    "adsets": ("id", "name", "campaign_id", "effective_status"),
+    "ads": ("id", "name", "adset_id", "effective_status"),
+}
+
 
 @dataclass(frozen=True)
 class MetaObject:
@@ -12,55 +27,130 @@ class MetaObject:
     status: str = ""  # effective_status from Meta API (ACTIVE, PAUSED, etc.)
 
 
-def _list_objects(client: MetaGraphClient, path: str, *, fields: Sequence[str]) -> List[Dict[str, Any]]:
-    pages = client.get_paged(path, params={"fields": ",".join(fields), "limit": 5000})
-    return list(iter_data_from_pages(pages))
+def clear_meta_cache() -> None:
+    """Drop all cached campaign/ad set/ad listings so the next call hits the API."""
+    with _cache_lock:
+        _cache.clear()
 
 
-def list_campaigns(client: MetaGraphClient, ad_account_id: str) -> List[MetaObject]:
-    rows = _list_objects(client, f"{ad_account_id}/campaigns", fields=["id", "name", "effective_status"])
+def _cache_get(key: Tuple[Any, ...]) -> Optional[List[MetaObject]]:
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _CACHE_TTL_SECONDS:
+        return list(hit[1])
+    return None
+
+
+def _cache_put(key: Tuple[Any, ...], items: List[MetaObject]) -> None:
+    with _cache_lock:
+        _cache.pop(key, None)
+        while len(_cache) >= _CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so the first entry is the oldest.
+            del _cache[next(iter(_cache))]
+        _cache[key] = (time.monotonic(), items)
+
+
+def _cached(key: Tuple[Any, ...], load: Callable[[], List[MetaObject]]) -> List[MetaObject]:
+    items = _cache_get(key)
+    if items is None:
+        items = load()
+        _cache_put(key, items)
+    return list(items)
+
+
+def _objects_from_pages(pages: Iterable[Dict[str, Any]]) -> List[MetaObject]:
     items = [
         MetaObject(
             id=r["id"],
             name=r.get("name", r["id"]),
             status=r.get("effective_status", ""),
         )
-        for r in rows if "id" in r
+        for r in iter_data_from_pages(pages) if "id" in r
     ]
     return sorted(items, key=lambda x: x.name.lower())
 
 
+def _list_params(fields: Sequence[str], filtering: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"fields": ",".join(fields), "limit": 5000}
+    if filtering:
+        params["filtering"] = list(filtering)
+    return params
+
+
+def _list_objects(
+    client: MetaGraphClient,
+    path: str,
+    *,
+    fields: Sequence[str],
+    filtering: Sequence[Dict[str, Any]] = (),
+) -> List[MetaObject]:
+    # Graph API object edges use cursor-based paging, so pages cannot be requested
+    # out of order; client.get_paged already overlaps the next request with the
+    # consumption of the current page.
+    return _objects_from_pages(client.get_paged(path, params=_list_params(fields, filtering)))
+
+
+def list_campaigns(client: MetaGraphClient, ad_account_id: str) -> List[MetaObject]:
+    return _cached((client, "campaigns", ad_account_id, ()), lambda: _load_campaigns(client, ad_account_id))
+
+
+def _load_campaigns(client: MetaGraphClient, ad_account_id: str) -> List[MetaObject]:
+    return _list_objects(client, f"{ad_account_id}/campaigns", fields=_FIELDS["campaigns"])
+
+
 def list_adsets(client: MetaGraphClient, ad_account_id: str, *, campaign_ids: Sequence[str] = ()) -> List[MetaObject]:
-    params: Dict[str, Any] = {"fields": "id,name,campaign_id,effective_status", "limit": 5000}
-    if campaign_ids:
-        params["filtering"] = [{"field": "campaign.id", "operator": "IN", "value": list(campaign_ids)}]
-    pages = client.get_paged(f"{ad_account_id}/adsets", params=params)
-    rows = list(iter_data_from_pages(pages))
-    items = [
-        MetaObject(
-            id=r["id"],
-            name=r.get("name", r["id"]),
-            status=r.get("effective_status", ""),
-        )
-        for r in rows if "id" in r
-    ]
-    return sorted(items, key=lambda x: x.name.lower())
+    campaign_ids = tuple(sorted(campaign_ids))
+    return _cached(
+        (client, "adsets", ad_account_id, campaign_ids),
+        lambda: _load_adsets(client, ad_account_id, campaign_ids),
+    )
+
+
+def _load_adsets(client: MetaGraphClient, ad_account_id: str, campaign_ids: Sequence[str]) -> List[MetaObject]:
+    filtering = [{"field": "campaign.id", "operator": "IN", "value": list(campaign_ids)}] if campaign_ids else []
+    return _list_objects(
+        client,
+        f"{ad_account_id}/adsets",
+        fields=_FIELDS["adsets"],
+        filtering=filtering,
+    )
 
 
 def list_ads(client: MetaGraphClient, ad_account_id: str, *, adset_ids: Sequence[str] = ()) -> List[MetaObject]:
-    params: Dict[str, Any] = {"fields": "id,name,adset_id,effective_status", "limit": 5000}
-    if adset_ids:
-        params["filtering"] = [{"field": "adset.id", "operator": "IN", "value": list(adset_ids)}]
-    pages = client.get_paged(f"{ad_account_id}/ads", params=params)
-    rows = list(iter_data_from_pages(pages))
-    items = [
-        MetaObject(
-            id=r["id"],
-            name=r.get("name", r["id"]),
-            status=r.get("effective_status", ""),
-        )
-        for r in rows if "id" in r
-    ]
-    return sorted(items, key=lambda x: x.name.lower())
+    adset_ids = tuple(sorted(adset_ids))
+    return _cached(
+        (client, "ads", ad_account_id, adset_ids),
+        lambda: _load_ads(client, ad_account_id, adset_ids),
+    )
+
+
+def _load_ads(client: MetaGraphClient, ad_account_id: str, adset_ids: Sequence[str]) -> List[MetaObject]:
+    filtering = [{"field": "adset.id", "operator": "IN", "value": list(adset_ids)}] if adset_ids else []
+    return _list_objects(
+        client,
+        f"{ad_account_id}/ads",
+        fields=_FIELDS["ads"],
+        filtering=filtering,
+    )
+
+
+def list_campaign_adset_ad_bundle(client: MetaGraphClient, ad_account_id: str) -> Dict[str, List[MetaObject]]:
+    """
+    Fetch all campaigns, ad sets and ads of an ad account in one Graph API batch call.
 
+    Returns a dict with "campaigns", "adsets" and "ads" lists. Results are stored in
+    the same TTL cache that list_campaigns/list_adsets/list_ads read from.
+    """
+    kinds = tuple(_FIELDS)
+    keys = {kind: (client, kind, ad_account_id, ()) for kind in kinds}
+    cached = {kind: _cache_get(keys[kind]) for kind in kinds}
+    if all(items is not None for items in cached.values()):
+        return cached  # type: ignore[return-value]
 
+    bodies = client.get_batch([(f"{ad_account_id}/{kind}", _list_params(_FIELDS[kind])) for kind in kinds])
+    bundle: Dict[str, List[MetaObject]] = {}
+    for kind, body in zip(kinds, bodies):
+        items = _objects_from_pages(client.follow_paging(body))
+        _cache_put(keys[kind], items)
+        bundle[kind] = list(items)
+    return bundle
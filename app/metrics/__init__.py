@@ -1,21 +1,33 @@
 """Metric computation helpers."""
 
-from app.metrics.cpl import compute_cpl, count_leads_from_actions, extract_action_value
+from app.metrics.cpl import (
+    action_column,
+    compute_cpl,
+    count_leads_from_actions,
+    count_leads_from_columns,
+    extract_action_value,
+    sum_action_values_series,
+)
 from app.metrics.revenue import (
     RevenueKPIs,
     calculate_revenue_kpis,
     calculate_kpis_by_dimension,
+    calculate_kpis_by_dimension_columnar,
     identify_problem_areas,
     calculate_period_comparison,
 )
 
 __all__ = [
+    "action_column",
     "compute_cpl",
     "count_leads_from_actions",
+    "count_leads_from_columns",
     "extract_action_value",
+    "sum_action_values_series",
     "RevenueKPIs",
     "calculate_revenue_kpis",
     "calculate_kpis_by_dimension",
+    "calculate_kpis_by_dimension_columnar",
     "identify_problem_areas",
     "calculate_period_comparison",
 ]
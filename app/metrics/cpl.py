@@ -1,40 +1,109 @@
 from __future__ import annotations
 
-from decimal import Decimal, InvalidOperation
-from typing import Any, Iterable, Mapping, Sequence
+import math
+from typing import Any, Collection, Iterable, Mapping
 
+import numpy as np
+import pandas as pd
 
-def _to_decimal(value: Any) -> Decimal | None:
+
+def _to_float(value: Any) -> float | None:
     if value is None:
         return None
     try:
-        return Decimal(str(value))
-    except (InvalidOperation, ValueError):
+        f = float(value)
+    except (TypeError, ValueError):
         return None
+    return f if math.isfinite(f) else None
 
 
-def extract_action_value(actions: Any, *, action_type: str) -> Decimal:
+def extract_action_value(actions: Any, *, action_type: str) -> float:
     """
     actions is typically a list[{"action_type": "...", "value": "..."}]
     """
     if not isinstance(actions, list):
-        return Decimal(0)
-    total = Decimal(0)
+        return 0.0
+    total = 0.0
     for item in actions:
         if not isinstance(item, Mapping):
             continue
         if item.get("action_type") != action_type:
             continue
-        d = _to_decimal(item.get("value"))
-        if d is not None:
-            total += d
+        v = _to_float(item.get("value"))
+        if v is not None:
+            total += v
     return total
 
 
-def count_leads_from_actions(actions: Any, *, lead_action_types: Sequence[str]) -> int:
-    total = Decimal(0)
-    for t in lead_action_types:
-        total += extract_action_value(actions, action_type=t)
+def sum_action_values_series(actions_col: pd.Series, action_type: str) -> pd.Series:
+    """
+    Column-wise extract_action_value: sums the values of action_type in every row of a
+    Series of action lists with one explode + groupby, aligned to actions_col's index.
+    """
+    positional = actions_col.reset_index(drop=True)
+    exploded = positional[positional.map(lambda v: isinstance(v, list))].explode().dropna()
+    matched = exploded[[isinstance(d, Mapping) and d.get("action_type") == action_type for d in exploded]]
+    values = pd.to_numeric(
+        pd.Series([d.get("value") for d in matched], index=matched.index, dtype=object),
+        errors="coerce",
+    ).astype("float64")
+    values = values[np.isfinite(values)]
+    totals = values.groupby(level=0).sum().reindex(positional.index, fill_value=0.0)
+    return pd.Series(totals.to_numpy(), index=actions_col.index, name=action_type)
+
+
+def action_column(action_type: str) -> str:
+    """Name of the per-row column holding action_type's value in pivoted insights frames."""
+    return f"action_{action_type}"
+
+
+def action_values_by_type(actions: Any, *, action_types: Collection[str]) -> dict[str, float]:
+    """
+    Totals per action_type for the requested types, in a single pass over actions.
+    Types without a parseable value are absent from the result.
+    """
+    totals: dict[str, float] = {}
+    if not isinstance(actions, list):
+        return totals
+    for item in actions:
+        if not isinstance(item, Mapping):
+            continue
+        t = item.get("action_type")
+        if t not in action_types:
+            continue
+        v = _to_float(item.get("value"))
+        if v is not None:
+            totals[t] = totals.get(t, 0.0) + v
+    return totals
+
+
+def count_leads_from_columns(df: pd.DataFrame, *, lead_action_types: Collection[str]) -> pd.Series:
+    """
+    Vectorized count_leads_from_actions for frames whose actions were pivoted into
+    action_<type> columns (see action_column). Missing columns count as 0.
+    """
+    cols = [action_column(t) for t in dict.fromkeys(lead_action_types)]
+    total = df.reindex(columns=cols, fill_value=0.0).sum(axis=1).to_numpy(dtype="float64")
+    leads = np.where(total > 0, np.trunc(total), 0).astype("int64")
+    return pd.Series(leads, index=df.index, name="leads")
+
+
+def count_leads_from_actions(actions: Any, *, lead_action_types: Collection[str]) -> int:
+    """
+    Sums the values of every action whose action_type is one of lead_action_types, in a
+    single pass over actions. Callers invoking this per row should pass a frozenset.
+    """
+    if not isinstance(actions, list):
+        return 0
+    total = 0.0
+    for item in actions:
+        if not isinstance(item, Mapping):
+            continue
+        if item.get("action_type") not in lead_action_types:
+            continue
+        v = _to_float(item.get("value"))
+        if v is not None:
+            total += v
     if total <= 0:
         return 0
     # Lead counts should be integral; guard against decimals in API by rounding down.
@@ -42,11 +111,11 @@ def count_leads_from_actions(actions: Any, *, lead_action_types: Sequence[str])
 
 
 def compute_cpl(spend: Any, leads: int) -> float | None:
-    d_spend = _to_decimal(spend)
-    if d_spend is None:
+    spend_f = _to_float(spend)
+    if spend_f is None:
         return None
     if leads <= 0:
         return None
-    return float(d_spend / Decimal(leads))
+    return spend_f / leads
 
 
@@ -7,10 +7,11 @@ from combined Meta Ads and Leadspedia data.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 
@@ -34,6 +35,20 @@ def _safe_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
+# Additive columns aggregated by the KPI calculations. Columns missing from the
+# input are treated as zero.
+_KPI_AMOUNT_COLUMNS = ("spend", "revenue", "payout")
+_KPI_COUNT_COLUMNS = (
+    "meta_leads",
+    "lp_total_leads",
+    "lp_sold_leads",
+    "lp_rejected_leads",
+    "lp_pending_leads",
+    "clicks",
+)
+_KPI_SUM_COLUMNS = _KPI_AMOUNT_COLUMNS + _KPI_COUNT_COLUMNS
+
+
 @dataclass
 class RevenueKPIs:
     """Calculated revenue and profitability KPIs."""
@@ -84,39 +99,28 @@ class RevenueKPIs:
     sell_rate_vs_target: float  # Actual sell rate vs target
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization (floats rounded for display)."""
         return {
-            "total_spend": self.total_spend,
-            "total_revenue": self.total_revenue,
-            "total_payout": self.total_payout,
-            "net_revenue": self.net_revenue,
-            "gross_profit": self.gross_profit,
-            "net_profit": self.net_profit,
-            "roas": self.roas,
-            "roi_pct": self.roi_pct,
-            "profit_margin_pct": self.profit_margin_pct,
-            "total_meta_leads": self.total_meta_leads,
-            "total_lp_leads": self.total_lp_leads,
-            "sold_leads": self.sold_leads,
-            "rejected_leads": self.rejected_leads,
-            "pending_leads": self.pending_leads,
-            "unsold_leads": self.unsold_leads,
-            "sell_through_rate": self.sell_through_rate,
-            "rejection_rate": self.rejection_rate,
-            "conversion_rate": self.conversion_rate,
-            "cpl": self.cpl,
-            "rpl": self.rpl,
-            "ppl": self.ppl,
-            "avg_sale_price": self.avg_sale_price,
-            "epc": self.epc,
-            "cpc": self.cpc,
-            "break_even_cpl": self.break_even_cpl,
-            "break_even_sell_rate": self.break_even_sell_rate,
-            "is_profitable": self.is_profitable,
-            "margin_vs_target": self.margin_vs_target,
-            "sell_rate_vs_target": self.sell_rate_vs_target,
+            name: round(value, _KPI_PRECISION.get(name, 2)) if isinstance(value, float) else value
+            for name, value in ((name, getattr(self, name)) for name in _KPI_FIELD_NAMES)
         }
 
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> RevenueKPIs:
+        """Build one KPIs object from a row of calculate_kpis_by_dimension_columnar()."""
+        values = {name: row[name] for name in _KPI_FIELD_NAMES}
+        return cls(**{k: v.item() if isinstance(v, np.generic) else v for k, v in values.items()})
+
+    def rounded(self) -> RevenueKPIs:
+        """Copy with every float rounded to its display precision."""
+        return RevenueKPIs(**self.to_dict())
+
+
+# Field names in declaration order, resolved once for to_dict()
+_KPI_FIELD_NAMES = tuple(f.name for f in fields(RevenueKPIs))
+# Decimal places used when rounding for display; other float fields use 2
+_KPI_PRECISION = {"epc": 4, "cpc": 4}
+
 
 def calculate_revenue_kpis(
     df: pd.DataFrame,
@@ -149,21 +153,46 @@ def calculate_revenue_kpis(
     if df.empty:
         return _empty_kpis(target_roi, target_sell_rate)
     
-    # Core aggregations
-    total_spend = _safe_float(df["spend"].sum()) if "spend" in df.columns else 0.0
-    total_revenue = _safe_float(df["revenue"].sum()) if "revenue" in df.columns else 0.0
-    total_payout = _safe_float(df["payout"].sum()) if "payout" in df.columns else 0.0
+    # Core aggregations (one pass over all additive columns). This is deliberately
+    # not memoized: fingerprinting the frame (hash_pandas_object) is an O(rows)
+    # pass that costs more than this sum.
+    sums = df.reindex(columns=list(_KPI_SUM_COLUMNS), fill_value=0)
+    # A mixed-dtype DataFrame.sum() upcasts every total to float64; reduce the
+    # count columns on their own so lead/click totals stay int64.
+    totals = {
+        **sums[list(_KPI_AMOUNT_COLUMNS)].sum().to_dict(),
+        **sums[list(_KPI_COUNT_COLUMNS)].sum().astype("int64").to_dict(),
+    }
+    return _kpis_from_totals(totals, target_roi=target_roi, target_sell_rate=target_sell_rate)
+
+
+def _kpis_from_totals(
+    totals: Mapping[str, Any],
+    *,
+    target_roi: float,
+    target_sell_rate: float,
+    rounded: bool = True,
+) -> RevenueKPIs:
+    """
+    Derive the full KPI set from summed `_KPI_SUM_COLUMNS` values.
+    
+    With rounded=False the values are left at full precision; they are rounded
+    for presentation by RevenueKPIs.to_dict().
+    """
+    total_spend = _safe_float(totals["spend"])
+    total_revenue = _safe_float(totals["revenue"])
+    total_payout = _safe_float(totals["payout"])
     
     # Lead counts
-    total_meta_leads = int(df["meta_leads"].sum()) if "meta_leads" in df.columns else 0
-    total_lp_leads = int(df["lp_total_leads"].sum()) if "lp_total_leads" in df.columns else 0
-    sold_leads = int(df["lp_sold_leads"].sum()) if "lp_sold_leads" in df.columns else 0
-    rejected_leads = int(df["lp_rejected_leads"].sum()) if "lp_rejected_leads" in df.columns else 0
-    pending_leads = int(df["lp_pending_leads"].sum()) if "lp_pending_leads" in df.columns else 0
+    total_meta_leads = int(totals["meta_leads"])
+    total_lp_leads = int(totals["lp_total_leads"])
+    sold_leads = int(totals["lp_sold_leads"])
+    rejected_leads = int(totals["lp_rejected_leads"])
+    pending_leads = int(totals["lp_pending_leads"])
     unsold_leads = total_lp_leads - sold_leads
     
     # Click count
-    total_clicks = int(df["clicks"].sum()) if "clicks" in df.columns else 0
+    total_clicks = int(totals["clicks"])
     
     # Financial calculations
     net_revenue = total_revenue - total_payout
@@ -201,37 +230,38 @@ def calculate_revenue_kpis(
     margin_vs_target = roi_pct - target_roi
     sell_rate_vs_target = sell_through_rate - target_sell_rate
     
-    return RevenueKPIs(
-        total_spend=round(total_spend, 2),
-        total_revenue=round(total_revenue, 2),
-        total_payout=round(total_payout, 2),
-        net_revenue=round(net_revenue, 2),
-        gross_profit=round(gross_profit, 2),
-        net_profit=round(net_profit, 2),
-        roas=round(roas, 2),
-        roi_pct=round(roi_pct, 2),
-        profit_margin_pct=round(profit_margin_pct, 2),
+    kpis = RevenueKPIs(
+        total_spend=total_spend,
+        total_revenue=total_revenue,
+        total_payout=total_payout,
+        net_revenue=net_revenue,
+        gross_profit=gross_profit,
+        net_profit=net_profit,
+        roas=roas,
+        roi_pct=roi_pct,
+        profit_margin_pct=profit_margin_pct,
         total_meta_leads=total_meta_leads,
         total_lp_leads=total_lp_leads,
         sold_leads=sold_leads,
         rejected_leads=rejected_leads,
         pending_leads=pending_leads,
         unsold_leads=unsold_leads,
-        sell_through_rate=round(sell_through_rate, 2),
-        rejection_rate=round(rejection_rate, 2),
-        conversion_rate=round(conversion_rate, 2),
-        cpl=round(cpl, 2),
-        rpl=round(rpl, 2),
-        ppl=round(ppl, 2),
-        avg_sale_price=round(avg_sale_price, 2),
-        epc=round(epc, 4),
-        cpc=round(cpc, 4),
-        break_even_cpl=round(break_even_cpl, 2),
-        break_even_sell_rate=round(break_even_sell_rate, 2),
+        sell_through_rate=sell_through_rate,
+        rejection_rate=rejection_rate,
+        conversion_rate=conversion_rate,
+        cpl=cpl,
+        rpl=rpl,
+        ppl=ppl,
+        avg_sale_price=avg_sale_price,
+        epc=epc,
+        cpc=cpc,
+        break_even_cpl=break_even_cpl,
+        break_even_sell_rate=break_even_sell_rate,
         is_profitable=is_profitable,
-        margin_vs_target=round(margin_vs_target, 2),
-        sell_rate_vs_target=round(sell_rate_vs_target, 2),
+        margin_vs_target=margin_vs_target,
+        sell_rate_vs_target=sell_rate_vs_target,
     )
+    return kpis.rounded() if rounded else kpis
 
 
 def _empty_kpis(target_roi: float, target_sell_rate: float) -> RevenueKPIs:
@@ -291,16 +321,187 @@ def calculate_kpis_by_dimension(
     if df.empty or dimension not in df.columns:
         return {}
     
-    result = {}
-    for value in df[dimension].unique():
-        subset = df[df[dimension] == value]
-        result[str(value)] = calculate_revenue_kpis(
-            subset,
+    # One hashed pass to sum every group, then derive KPIs from each group's totals.
+    # Per-group KPIs are kept unrounded; to_dict() rounds them for presentation.
+    sums = df.reindex(columns=list(_KPI_SUM_COLUMNS), fill_value=0)
+    agg = sums.groupby(df[dimension], observed=True, sort=False, dropna=False).sum()
+    
+    return {
+        str(value): _kpis_from_totals(
+            totals,
             target_roi=target_roi,
             target_sell_rate=target_sell_rate,
+            rounded=False,
         )
+        for value, totals in zip(agg.index, agg.to_dict("records"))
+    }
+
+
+# Inputs of identify_problem_areas and the value used when a row or the frame lacks one
+_PROBLEM_METRIC_DEFAULTS = {
+    "sell_through_rate": 100.0,
+    "roi": 0.0,
+    "profit": 0.0,
+    "rejection_rate": 0.0,
+    "cpl": 0.0,
+    "break_even_cpl": float("inf"),
+}
+# Issue descriptions, one per bit of the mask returned by _score_problem_rows
+_ISSUE_FORMATS = (
+    "Low sell-through: {sell_rate:.1f}% (target: {target_sell_rate}%)",
+    "Low ROI: {roi:.1f}% (target: {target_roi}%)",
+    "Negative profit: ${profit:.2f}",
+    "High rejection: {rejection_rate:.1f}%",
+    "CPL ${cpl:.2f} exceeds break-even ${break_even:.2f}",
+)
+# Sort order of the severity column (most severe first)
+_SEVERITY_ORDER = pd.CategoricalDtype(["critical", "warning", "info"], ordered=True)
+
+
+def _score_problem_rows(
+    sell_rate: np.ndarray,
+    roi: np.ndarray,
+    profit: np.ndarray,
+    rejection_rate: np.ndarray,
+    cpl: np.ndarray,
+    break_even: np.ndarray,
+    *,
+    target_sell_rate: float,
+    target_roi: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Numeric scoring for identify_problem_areas.
+    
+    Returns:
+        (severity codes as int8: 0=info, 1=warning, 2=critical,
+         issue bitmask as uint8 with one bit per entry of _ISSUE_FORMATS)
+    """
+    low_sell = sell_rate < target_sell_rate
+    low_roi = roi < target_roi
+    neg_profit = profit < 0
+    high_rej = rejection_rate > 10  # More than 10% rejection
+    cpl_over = (cpl > break_even) & (break_even > 0)
+    
+    issue_mask = (
+        low_sell.astype(np.uint8)
+        | (low_roi.astype(np.uint8) << 1)
+        | (neg_profit.astype(np.uint8) << 2)
+        | (high_rej.astype(np.uint8) << 3)
+        | (cpl_over.astype(np.uint8) << 4)
+    )
+    
+    # Severity: any critical condition wins, otherwise any other issue is a warning
+    critical = (
+        (low_sell & (sell_rate < target_sell_rate - 10))
+        | (low_roi & (roi < 0))
+        | neg_profit
+        | cpl_over
+    )
+    severity_code = np.where(critical, 2, (issue_mask != 0).astype(np.int8)).astype(np.int8)
+    return severity_code, issue_mask
+
+
+def calculate_kpis_by_dimension_columnar(
+    df: pd.DataFrame,
+    dimension: str,
+    *,
+    target_roi: float = 20.0,
+    target_sell_rate: float = 95.0,
+) -> pd.DataFrame:
+    """
+    Columnar variant of calculate_kpis_by_dimension.
+    
+    Instead of one RevenueKPIs object per group, returns a DataFrame indexed by the
+    dimension values with one column per RevenueKPIs field, so callers can sort,
+    filter or take top-N (e.g. `kpi_df.nlargest(10, "roas")`) without a Python loop.
+    Values are unrounded; use RevenueKPIs.from_row() when a single object is needed.
+    
+    Args:
+        df: Combined data DataFrame
+        dimension: Column name to group by (e.g., 'campaign_name', 'adset_name')
+        target_roi: Target ROI percentage
+        target_sell_rate: Target sell-through rate
+        
+    Returns:
+        DataFrame of KPIs, one row per dimension value
+    """
+    if df.empty or dimension not in df.columns:
+        return pd.DataFrame(columns=list(_KPI_FIELD_NAMES))
     
-    return result
+    sums = df.reindex(columns=list(_KPI_SUM_COLUMNS), fill_value=0)
+    agg = sums.groupby(df[dimension], observed=True, sort=False, dropna=False).sum()
+    return _kpi_frame_from_totals(agg, target_roi=target_roi, target_sell_rate=target_sell_rate)
+
+
+def _kpi_frame_from_totals(
+    agg: pd.DataFrame,
+    *,
+    target_roi: float,
+    target_sell_rate: float,
+) -> pd.DataFrame:
+    """Vectorized _kpis_from_totals over a frame of per-group `_KPI_SUM_COLUMNS` totals."""
+    def ratio(num: np.ndarray, den: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        # num / den * scale, or 0 where den is not positive (as in the scalar path);
+        # divides in place into a zeroed buffer instead of allocating masked temporaries
+        out = np.zeros(len(num))
+        np.divide(num, den, out=out, where=den > 0)
+        if scale != 1.0:
+            out *= scale
+        return out
+    
+    def amount(col: str) -> np.ndarray:
+        return np.nan_to_num(pd.to_numeric(agg[col], errors="coerce").to_numpy(dtype=np.float64))
+    
+    spend = amount("spend")
+    revenue = amount("revenue")
+    payout = amount("payout")
+    meta_leads, lp_leads, sold, rejected, pending, clicks = (
+        agg[col].to_numpy(dtype=np.int64) for col in _KPI_COUNT_COLUMNS
+    )
+    
+    net_revenue = revenue - payout
+    gross_profit = revenue - spend
+    roi_pct = ratio(gross_profit, spend, 100)
+    sell_through_rate = ratio(sold, lp_leads, 100)
+    cpl = ratio(spend, meta_leads)
+    avg_sale_price = ratio(revenue, sold)
+    break_even_cpl = avg_sale_price * (sell_through_rate / 100)
+    
+    return pd.DataFrame(
+        {
+            "total_spend": spend,
+            "total_revenue": revenue,
+            "total_payout": payout,
+            "net_revenue": net_revenue,
+            "gross_profit": gross_profit,
+            "net_profit": net_revenue - spend,
+            "roas": ratio(revenue, spend),
+            "roi_pct": roi_pct,
+            "profit_margin_pct": ratio(gross_profit, revenue, 100),
+            "total_meta_leads": meta_leads,
+            "total_lp_leads": lp_leads,
+            "sold_leads": sold,
+            "rejected_leads": rejected,
+            "pending_leads": pending,
+            "unsold_leads": lp_leads - sold,
+            "sell_through_rate": sell_through_rate,
+            "rejection_rate": ratio(rejected, lp_leads, 100),
+            "conversion_rate": ratio(sold, meta_leads, 100),
+            "cpl": cpl,
+            "rpl": ratio(revenue, meta_leads),
+            "ppl": ratio(gross_profit, meta_leads),
+            "avg_sale_price": avg_sale_price,
+            "epc": ratio(revenue, clicks),
+            "cpc": ratio(spend, clicks),
+            # avg_sale_price is 0 wherever the scalar path zeroes break-even CPL
+            "break_even_cpl": break_even_cpl,
+            "break_even_sell_rate": ratio(cpl, avg_sale_price, 100),
+            "is_profitable": gross_profit > 0,
+            "margin_vs_target": roi_pct - target_roi,
+            "sell_rate_vs_target": sell_through_rate - target_sell_rate,
+        },
+        index=agg.index,
+    )
 
 
 def identify_problem_areas(
@@ -328,77 +529,79 @@ def identify_problem_areas(
         return pd.DataFrame()
     
     # Filter to rows with sufficient spend
-    analysis_df = df[df["spend"] >= min_spend].copy() if "spend" in df.columns else df.copy()
+    # Column names are checked many times below; look them up in a set once
+    present = frozenset(df.columns)
+    analysis_df = df[df["spend"] >= min_spend] if "spend" in present else df
     
     if analysis_df.empty:
         return pd.DataFrame()
     
-    problems = []
+    # Missing columns and missing values both take the metric's neutral default
+    metrics = (
+        analysis_df.reindex(columns=list(_PROBLEM_METRIC_DEFAULTS))
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(_PROBLEM_METRIC_DEFAULTS)
+    )
+    sell_rate, roi, profit, rejection_rate, cpl, break_even = (
+        metrics[col].to_numpy(dtype=np.float64) for col in _PROBLEM_METRIC_DEFAULTS
+    )
     
-    for idx, row in analysis_df.iterrows():
-        issues = []
-        severity = "info"
-        
-        # Check sell-through rate
-        sell_rate = _safe_float(row.get("sell_through_rate", 100))
-        if sell_rate < target_sell_rate:
-            issues.append(f"Low sell-through: {sell_rate:.1f}% (target: {target_sell_rate}%)")
-            severity = "warning" if sell_rate >= target_sell_rate - 10 else "critical"
-        
-        # Check ROI
-        roi = _safe_float(row.get("roi", 0))
-        if roi < target_roi:
-            issues.append(f"Low ROI: {roi:.1f}% (target: {target_roi}%)")
-            if roi < 0:
-                severity = "critical"
-            elif severity != "critical":
-                severity = "warning"
-        
-        # Check for negative profit
-        profit = _safe_float(row.get("profit", 0))
-        if profit < 0:
-            issues.append(f"Negative profit: ${profit:.2f}")
-            severity = "critical"
-        
-        # Check for high rejection rate
-        rejection_rate = _safe_float(row.get("rejection_rate", 0))
-        if rejection_rate > 10:  # More than 10% rejection
-            issues.append(f"High rejection: {rejection_rate:.1f}%")
-            if severity != "critical":
-                severity = "warning"
-        
-        # Check CPL vs break-even
-        cpl = _safe_float(row.get("cpl", 0))
-        break_even = _safe_float(row.get("break_even_cpl", float("inf")))
-        if cpl > break_even and break_even > 0:
-            issues.append(f"CPL ${cpl:.2f} exceeds break-even ${break_even:.2f}")
-            severity = "critical"
-        
-        if issues:
-            problems.append({
-                "campaign_name": row.get("campaign_name", ""),
-                "adset_name": row.get("adset_name", ""),
-                "ad_name": row.get("ad_name", ""),
-                "spend": row.get("spend", 0),
-                "revenue": row.get("revenue", 0),
-                "profit": profit,
-                "roi": roi,
-                "sell_through_rate": sell_rate,
-                "issues": "; ".join(issues),
-                "severity": severity,
-            })
-    
-    if not problems:
+    severity_code, issue_mask = _score_problem_rows(
+        sell_rate,
+        roi,
+        profit,
+        rejection_rate,
+        cpl,
+        break_even,
+        target_sell_rate=target_sell_rate,
+        target_roi=target_roi,
+    )
+    if not issue_mask.any():
         return pd.DataFrame()
     
-    result_df = pd.DataFrame(problems)
+    # Only rows with at least one issue need their descriptions formatted
+    rows = np.flatnonzero(issue_mask)
+    issues = []
+    for i in rows:
+        values = {
+            "sell_rate": sell_rate[i],
+            "roi": roi[i],
+            "profit": profit[i],
+            "rejection_rate": rejection_rate[i],
+            "cpl": cpl[i],
+            "break_even": break_even[i],
+            "target_sell_rate": target_sell_rate,
+            "target_roi": target_roi,
+        }
+        issues.append("; ".join(
+            fmt.format(**values)
+            for bit, fmt in enumerate(_ISSUE_FORMATS)
+            if issue_mask[i] & (1 << bit)
+        ))
+    
+    def _column(name: str, default: Any) -> Any:
+        if name in present:
+            return analysis_df[name].to_numpy()[rows]
+        return default
+    
+    result_df = pd.DataFrame({
+        "campaign_name": _column("campaign_name", ""),
+        "adset_name": _column("adset_name", ""),
+        "ad_name": _column("ad_name", ""),
+        "spend": _column("spend", 0),
+        "revenue": _column("revenue", 0),
+        "profit": profit[rows],
+        "roi": roi[rows],
+        "sell_through_rate": sell_rate[rows],
+        "issues": issues,
+        # Severity codes count up from info, categories run from critical
+        "severity": pd.Categorical.from_codes(2 - severity_code[rows], dtype=_SEVERITY_ORDER),
+    })
     # Sort by severity (critical first) then by profit (most negative first)
-    severity_order = {"critical": 0, "warning": 1, "info": 2}
-    result_df["_severity_order"] = result_df["severity"].map(severity_order)
     result_df = result_df.sort_values(
-        by=["_severity_order", "profit"],
+        by=["severity", "profit"],
         ascending=[True, True]
-    ).drop(columns=["_severity_order"])
+    )
     
     return result_df
 
@@ -422,11 +625,17 @@ def calculate_period_comparison(
     Returns:
         Dictionary with current, previous, and change metrics
     """
-    current_kpis = calculate_revenue_kpis(
-        current_df, target_roi=target_roi, target_sell_rate=target_sell_rate
+    # Sum both periods in one grouped pass; an empty period sums to zeros
+    cols = list(_KPI_SUM_COLUMNS)
+    stacked = pd.concat(
+        [current_df.reindex(columns=cols, fill_value=0), previous_df.reindex(columns=cols, fill_value=0)],
+        keys=[0, 1],
     )
-    previous_kpis = calculate_revenue_kpis(
-        previous_df, target_roi=target_roi, target_sell_rate=target_sell_rate
+    totals = stacked.groupby(level=0).sum().reindex([0, 1], fill_value=0)
+    # Row dicts keep each column's dtype (a .loc row would upcast counts to float)
+    current_kpis, previous_kpis = (
+        _kpis_from_totals(period_totals, target_roi=target_roi, target_sell_rate=target_sell_rate)
+        for period_totals in totals.to_dict("records")
     )
     
     def calc_change(current: float, previous: float) -> Dict[str, float]:
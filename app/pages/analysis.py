@@ -7,9 +7,11 @@ and generating AI-ready exports for Claude/ChatGPT analysis.
 
 from __future__ import annotations
 
+import hashlib
 import sys
 from datetime import date, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pandas as pd
 import streamlit as st
@@ -28,40 +30,321 @@ from app.analysis.confidence import (
 from app.analysis.llm_export import generate_llm_export
 from app.cache.sqlite_cache import SqliteCache
 from app.config import AppConfig, check_path_permissions
-from app.meta.client import MetaApiError, MetaGraphClient
-from app.meta.insights import InsightsQuery, fetch_insights_frame_cached
-from app.meta.objects import MetaObject, list_ads, list_adsets, list_campaigns
 
+# The Meta modules pull in requests/urllib3/tenacity; they are imported where first
+# needed so a page that stops at the config checks never loads them
+if TYPE_CHECKING:
+    from app.meta.client import MetaGraphClient
+    from app.meta.objects import MetaObject
 
-def _render_confidence_badge(confidence: ConfidenceLevel) -> str:
-    """Return HTML badge for confidence level."""
-    colors = {
+
+# Confidence filter options and the levels each keeps (None = no filtering)
+_CONFIDENCE_FILTERS: dict[str, tuple[ConfidenceLevel, ...] | None] = {
+    "All": None,
+    "High only": (ConfidenceLevel.HIGH,),
+    "Medium and above": (ConfidenceLevel.HIGH, ConfidenceLevel.MEDIUM),
+}
+
+# Ranker table columns, in display order, and their labels
+_RANKER_COLUMNS: dict[str, str] = {
+    "confidence_emoji": "Conf",
+    "ad_name": "Ad Name",
+    "campaign_name": "Campaign",
+    "spend": "Spend",
+    "leads": "Leads",
+    "cpl": "CPL",
+    "action_display": "Action",
+}
+
+
+def _badge_html(fg: str, bg: str, label: str) -> str:
+    return f'<span style="background:{bg};color:{fg};padding:2px 8px;border-radius:4px;font-weight:600;font-size:12px;">{label}</span>'
+
+
+# Badge markup has only a handful of possible outputs; build it once at import
+_CONFIDENCE_BADGE_HTML = {
+    level: _badge_html(fg, bg, level.value.upper())
+    for level, (fg, bg) in {
         ConfidenceLevel.HIGH: ("#22c55e", "#dcfce7"),  # green
         ConfidenceLevel.MEDIUM: ("#eab308", "#fef9c3"),  # yellow
         ConfidenceLevel.LOW: ("#ef4444", "#fee2e2"),  # red
-    }
-    fg, bg = colors.get(confidence, ("#6b7280", "#f3f4f6"))
-    label = confidence.value.upper()
-    return f'<span style="background:{bg};color:{fg};padding:2px 8px;border-radius:4px;font-weight:600;font-size:12px;">{label}</span>'
+    }.items()
+}
+_ACTION_BADGE_HTML = {
+    action: _badge_html(fg, bg, label)
+    for action, (fg, bg, label) in {
+        ActionRecommendation.SCALE: ("#22c55e", "#dcfce7", "SCALE ↑"),
+        ActionRecommendation.MAINTAIN: ("#3b82f6", "#dbeafe", "MAINTAIN →"),
+        ActionRecommendation.KILL: ("#ef4444", "#fee2e2", "KILL ✕"),
+        ActionRecommendation.NEEDS_DATA: ("#6b7280", "#f3f4f6", "NEEDS DATA"),
+    }.items()
+}
+_UNKNOWN_ACTION_BADGE_HTML = _badge_html("#6b7280", "#f3f4f6", "UNKNOWN")
+
+
+def _render_confidence_badge(confidence: ConfidenceLevel) -> str:
+    """Return HTML badge for confidence level."""
+    badge = _CONFIDENCE_BADGE_HTML.get(confidence)
+    if badge is None:
+        badge = _badge_html("#6b7280", "#f3f4f6", confidence.value.upper())
+    return badge
 
 
 def _render_action_badge(action: ActionRecommendation) -> str:
     """Return HTML badge for action recommendation."""
-    colors = {
-        ActionRecommendation.SCALE: ("#22c55e", "#dcfce7"),
-        ActionRecommendation.MAINTAIN: ("#3b82f6", "#dbeafe"),
-        ActionRecommendation.KILL: ("#ef4444", "#fee2e2"),
-        ActionRecommendation.NEEDS_DATA: ("#6b7280", "#f3f4f6"),
-    }
-    labels = {
-        ActionRecommendation.SCALE: "SCALE ↑",
-        ActionRecommendation.MAINTAIN: "MAINTAIN →",
-        ActionRecommendation.KILL: "KILL ✕",
-        ActionRecommendation.NEEDS_DATA: "NEEDS DATA",
-    }
-    fg, bg = colors.get(action, ("#6b7280", "#f3f4f6"))
-    label = labels.get(action, "UNKNOWN")
-    return f'<span style="background:{bg};color:{fg};padding:2px 8px;border-radius:4px;font-weight:600;font-size:12px;">{label}</span>'
+    return _ACTION_BADGE_HTML.get(action, _UNKNOWN_ACTION_BADGE_HTML)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_add_confidence(df: pd.DataFrame, thresholds_key: tuple) -> pd.DataFrame:
+    """add_confidence_columns, memoized across reruns for an unchanged frame and thresholds."""
+    return add_confidence_columns(df, ConfidenceThresholds(*thresholds_key))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_llm_export(
+    df: pd.DataFrame,
+    date_since: date,
+    date_until: date,
+    thresholds_key: tuple,
+    min_spend: float,
+    top_n: int,
+) -> str:
+    """generate_llm_export, memoized so reruns with unchanged inputs reuse the markdown."""
+    return generate_llm_export(
+        df,
+        date_since=date_since,
+        date_until=date_until,
+        thresholds=ConfidenceThresholds(*thresholds_key),
+        min_spend_for_ranking=min_spend,
+        top_n=top_n,
+        bottom_n=top_n,
+        include_full_data=True,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _get_client(api_version: str, token_key: str, _token: str) -> MetaGraphClient:
+    """One MetaGraphClient per API version/token, keyed by token_key so the token is never hashed."""
+    from app.meta.client import MetaGraphClient
+    
+    return MetaGraphClient(api_version=api_version, access_token=_token)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_cache(db_path: Path) -> SqliteCache:
+    """One SqliteCache per database path, shared across reruns and sessions."""
+    return SqliteCache(db_path=db_path)
+
+
+def _token_key(token: str) -> str:
+    """Short digest identifying an access token in cache keys (never the token itself)."""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_object_bundle(
+    _client: MetaGraphClient,
+    ad_account_id: str,
+    api_version: str,
+    token_key: str,
+) -> dict[str, list[MetaObject]]:
+    """Campaigns/ad sets/ads for an account; the unhashed client is keyed by api_version + token_key."""
+    from app.meta.objects import list_campaign_adset_ad_bundle
+    
+    return list_campaign_adset_ad_bundle(_client, ad_account_id)
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def _fetch_frame(
+    _client: MetaGraphClient,
+    _cache: SqliteCache,
+    ad_account_id: str,
+    since: date,
+    until: date,
+    campaign_ids: tuple[str, ...],
+    adset_ids: tuple[str, ...],
+    ad_ids: tuple[str, ...],
+    lead_action_types: tuple[str, ...],
+    ttl_seconds: int,
+    api_version: str,
+    token_key: str,
+) -> pd.DataFrame:
+    """
+    Ad-level insights for the page's query, shared across sessions and browser tabs.
+    
+    Sits in front of the SQLite cache (which persists across restarts); the unhashed
+    client/cache are keyed by api_version + token_key.
+    """
+    from app.meta.insights import InsightsQuery, fetch_insights_frame_cached
+    
+    query = InsightsQuery(
+        ad_account_id=ad_account_id,
+        since=since,
+        until=until,
+        level="ad",
+        breakdowns=[],
+        campaign_ids=campaign_ids,
+        adset_ids=adset_ids,
+        ad_ids=ad_ids,
+    )
+    return fetch_insights_frame_cached(
+        _client,
+        _cache,
+        query,
+        lead_action_types=lead_action_types,
+        ttl_seconds=ttl_seconds,
+    )
+
+
+@st.fragment
+def _render_ranker(df_sorted: pd.DataFrame) -> None:
+    """Creative Performance Ranker table and action counts."""
+    # ============================================
+    # SECTION 1: Creative Performance Ranker
+    # ============================================
+    st.subheader("🏆 Creative Performance Ranker")
+    st.caption("Ads ranked by CPL with confidence indicators and action recommendations.")
+    
+    # Select and label display columns
+    present = set(df_sorted.columns)
+    display_cols = [c for c in _RANKER_COLUMNS if c in present]
+    df_display = df_sorted[display_cols].rename(columns=_RANKER_COLUMNS)
+    
+    # Numbers stay numeric; the browser applies the display format
+    st.dataframe(
+        df_display,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Spend": st.column_config.NumberColumn("Spend", format="$%.2f"),
+            "CPL": st.column_config.NumberColumn("CPL", format="$%.2f"),
+            "Leads": st.column_config.NumberColumn("Leads", format="%d"),
+        },
+    )
+    
+    # Action summary
+    st.markdown("**Quick Summary:**")
+    # Counts in ActionRecommendation order: SCALE, MAINTAIN, KILL, NEEDS_DATA
+    scale_count, maintain_count, kill_count, needs_count = (
+        df_sorted["action"].value_counts().reindex(list(ActionRecommendation), fill_value=0).to_numpy()
+    )
+    cols = st.columns(4)
+    with cols[0]:
+        st.success(f"🟢 **SCALE:** {scale_count} ads")
+    with cols[1]:
+        st.info(f"🔵 **MAINTAIN:** {maintain_count} ads")
+    with cols[2]:
+        st.error(f"🔴 **KILL:** {kill_count} ads")
+    with cols[3]:
+        st.warning(f"⚪ **NEEDS DATA:** {needs_count} ads")
+
+
+@st.fragment
+def _render_significance(df_sorted: pd.DataFrame) -> None:
+    """Progress of NEEDS_DATA ads toward a statistically reliable lead count."""
+    # ============================================
+    # SECTION 2: Statistical Significance
+    # ============================================
+    st.subheader("📈 Statistical Significance")
+    
+    with st.expander("View data requirements for reliable decisions", expanded=False):
+        st.caption(
+            "Each ad needs ~50 leads for 95% confidence that the true CPL is within ±20% of observed CPL. "
+            "Below shows progress toward statistical significance."
+        )
+    
+        # Filter to ads that need more data
+        needs_data_df = df_sorted[df_sorted["action"] == ActionRecommendation.NEEDS_DATA]
+    
+        if needs_data_df.empty:
+            st.success("All ads have sufficient data for reliable decisions!")
+        else:
+            # One table instead of a columns/markdown/progress block per ad
+            progress_df = pd.DataFrame({
+                "Ad": needs_data_df["ad_name"] if "ad_name" in needs_data_df.columns else "Unknown",
+                "Current leads": needs_data_df["leads"].fillna(0).astype(int),
+                "Progress": needs_data_df["progress_pct"].fillna(0).clip(0, 100),
+                "Leads needed": needs_data_df["leads_needed"].fillna(0).astype(int),
+                "Spend needed": pd.to_numeric(needs_data_df["spend_needed"], errors="coerce"),
+            })
+            st.dataframe(
+                progress_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Progress": st.column_config.ProgressColumn(
+                        "Progress", min_value=0, max_value=100, format="%.0f%%"
+                    ),
+                    "Spend needed": st.column_config.NumberColumn("Spend needed", format="$%.0f"),
+                },
+            )
+
+
+@st.fragment
+def _render_llm_export(
+    df_with_confidence: pd.DataFrame,
+    date_since: date,
+    date_until: date,
+    thresholds_key: tuple,
+) -> None:
+    """LLM export controls, download and preview; its widgets only rerun this fragment."""
+    # ============================================
+    # SECTION 3: LLM Export
+    # ============================================
+    st.subheader("🤖 LLM Analysis Export")
+    st.caption("Generate a formatted export optimized for Claude or ChatGPT analysis.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        min_spend_export = st.number_input(
+            "Min spend for top/bottom ranking ($)",
+            min_value=0.0,
+            value=250.0,
+            step=50.0,
+            key="export_min_spend",
+        )
+    with col2:
+        top_n = st.number_input(
+            "Number of top/bottom performers",
+            min_value=3,
+            max_value=20,
+            value=5,
+            step=1,
+            key="export_top_n",
+        )
+    
+    # Nothing is generated until asked for; while enabled, option changes only
+    # rerun this fragment and unchanged inputs hit the export cache
+    if not st.checkbox("Generate LLM export", value=False, key="export_enabled"):
+        return
+    
+    # Generate export
+    export_md = _cached_llm_export(
+        df_with_confidence,
+        date_since,
+        date_until,
+        thresholds_key,
+        min_spend_export,
+        top_n,
+    )
+    
+    # Copy button and preview
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.download_button(
+            label="📥 Download as Markdown",
+            data=export_md,
+            file_name="meta_ads_analysis.md",
+            mime="text/markdown",
+        )
+    with col2:
+        if st.button("📋 Copy to Clipboard"):
+            st.code(export_md, language="markdown")
+            st.info("Select all the text above (Cmd+A / Ctrl+A) and copy (Cmd+C / Ctrl+C)")
+    
+    with st.expander("Preview LLM Export", expanded=False):
+        st.markdown(export_md, unsafe_allow_html=True)
 
 
 def main() -> None:
@@ -165,7 +448,7 @@ def main() -> None:
         st.subheader("Filters")
         confidence_filter = st.selectbox(
             "Show confidence levels",
-            ["All", "High only", "Medium and above"],
+            list(_CONFIDENCE_FILTERS),
         )
         
         # Load campaigns/adsets/ads
@@ -188,9 +471,12 @@ def main() -> None:
     if not effective_token:
         return
     
+    from app.meta.client import MetaApiError
+    
     # Initialize client and cache
-    client = MetaGraphClient(api_version=cfg.meta_api_version, access_token=effective_token)
-    cache = SqliteCache(db_path=cfg.cache_db_path)
+    token_key = _token_key(effective_token)
+    client = _get_client(cfg.meta_api_version, token_key, effective_token)
+    cache = _get_cache(cfg.cache_db_path)
     
     # Session state for objects
     if "analysis_campaigns" not in st.session_state:
@@ -201,9 +487,15 @@ def main() -> None:
     if load_objects:
         try:
             with st.spinner("Loading campaigns, ad sets, and ads..."):
-                st.session_state["analysis_campaigns"] = list_campaigns(client, cfg.meta_ad_account_id)
-                st.session_state["analysis_adsets"] = list_adsets(client, cfg.meta_ad_account_id)
-                st.session_state["analysis_ads"] = list_ads(client, cfg.meta_ad_account_id)
+                bundle = _cached_object_bundle(
+                    client,
+                    cfg.meta_ad_account_id,
+                    cfg.meta_api_version,
+                    token_key,
+                )
+                st.session_state["analysis_campaigns"] = bundle["campaigns"]
+                st.session_state["analysis_adsets"] = bundle["adsets"]
+                st.session_state["analysis_ads"] = bundle["ads"]
             st.success("Loaded objects successfully!")
         except MetaApiError as e:
             st.error(f"Failed to load objects: {e}")
@@ -217,23 +509,28 @@ def main() -> None:
     selected_adset_ids: list[str] = []
     selected_ad_ids: list[str] = []
     
+    # id -> name lookups, so labelling each option is a dict hit rather than a list scan
+    campaign_names = {c.id: c.name for c in campaigns}
+    adset_names = {a.id: a.name for a in adsets}
+    ad_names = {a.id: a.name for a in ads}
+    
     if campaigns:
         selected_campaign_ids = st.sidebar.multiselect(
             "Filter by Campaign",
-            options=[c.id for c in campaigns],
-            format_func=lambda cid: next((c.name for c in campaigns if c.id == cid), cid),
+            options=list(campaign_names),
+            format_func=campaign_names.get,
         )
     if adsets:
         selected_adset_ids = st.sidebar.multiselect(
             "Filter by Ad Set",
-            options=[a.id for a in adsets],
-            format_func=lambda aid: next((a.name for a in adsets if a.id == aid), aid),
+            options=list(adset_names),
+            format_func=adset_names.get,
         )
     if ads:
         selected_ad_ids = st.sidebar.multiselect(
             "Filter by Ad",
-            options=[a.id for a in ads],
-            format_func=lambda aid: next((a.name for a in ads if a.id == aid), aid),
+            options=list(ad_names),
+            format_func=ad_names.get,
         )
     
     # Build thresholds object
@@ -258,22 +555,20 @@ def main() -> None:
         if refresh_data:
             with st.spinner("Fetching data from Meta API..."):
                 try:
-                    query = InsightsQuery(
-                        ad_account_id=cfg.meta_ad_account_id,
-                        since=since,
-                        until=until,
-                        level="ad",
-                        breakdowns=[],
-                        campaign_ids=selected_campaign_ids,
-                        adset_ids=selected_adset_ids,
-                        ad_ids=selected_ad_ids,
-                    )
-                    df = fetch_insights_frame_cached(
+                    # Sorted ids so selection order doesn't change the cache key
+                    df = _fetch_frame(
                         client,
                         cache,
-                        query,
-                        lead_action_types=cfg.meta_lead_action_types,
-                        ttl_seconds=cfg.cache_ttl_seconds,
+                        cfg.meta_ad_account_id,
+                        since,
+                        until,
+                        tuple(sorted(selected_campaign_ids)),
+                        tuple(sorted(selected_adset_ids)),
+                        tuple(sorted(selected_ad_ids)),
+                        tuple(cfg.meta_lead_action_types),
+                        cfg.cache_ttl_seconds,
+                        cfg.meta_api_version,
+                        token_key,
                     )
                     st.session_state["analysis_df"] = df
                     st.session_state["analysis_since"] = since
@@ -291,23 +586,25 @@ def main() -> None:
             return
         
         # Add confidence columns
-        df_with_confidence = add_confidence_columns(df, thresholds)
+        df_with_confidence = _cached_add_confidence(df, thresholds.as_tuple())
         
-        # Apply confidence filter
-        if confidence_filter == "High only":
-            df_filtered = df_with_confidence[df_with_confidence["confidence"] == ConfidenceLevel.HIGH]
-        elif confidence_filter == "Medium and above":
-            df_filtered = df_with_confidence[df_with_confidence["confidence"].isin([ConfidenceLevel.HIGH, ConfidenceLevel.MEDIUM])]
-        else:
+        # Apply confidence filter ("All" keeps the scored frame itself, no row selection)
+        allowed_levels = _CONFIDENCE_FILTERS[confidence_filter]
+        if allowed_levels is None:
             df_filtered = df_with_confidence
+        else:
+            df_filtered = df_with_confidence.loc[df_with_confidence["confidence"].isin(allowed_levels)]
         
         # Summary metrics
         st.subheader("Summary")
         col1, col2, col3, col4, col5 = st.columns(5)
         
-        total_spend = df_filtered["spend"].sum() if "spend" in df_filtered.columns else 0
-        total_leads = int(df_filtered["leads"].sum()) if "leads" in df_filtered.columns else 0
+        # Both totals from one reduction; missing columns count as zero
+        totals = df_filtered.reindex(columns=["spend", "leads"], fill_value=0).sum()
+        total_spend = float(totals["spend"])
+        total_leads = int(totals["leads"])
         overall_cpl = total_spend / total_leads if total_leads > 0 else None
+        high_conf_count = int((df_filtered["confidence"] == ConfidenceLevel.HIGH).sum())
         
         with col1:
             st.metric("Total Spend", f"${total_spend:,.2f}")
@@ -318,175 +615,23 @@ def main() -> None:
         with col4:
             st.metric("Total Ads", len(df_filtered))
         with col5:
-            high_conf_count = len(df_filtered[df_filtered["confidence"] == ConfidenceLevel.HIGH])
             st.metric("High Confidence Ads", high_conf_count)
         
         st.divider()
         
-        # ============================================
-        # SECTION 1: Creative Performance Ranker
-        # ============================================
-        st.subheader("🏆 Creative Performance Ranker")
-        st.caption("Ads ranked by CPL with confidence indicators and action recommendations.")
-        
-        # Prepare display dataframe
-        display_cols = [
-            "confidence_emoji",
-            "ad_name",
-            "campaign_name",
-            "spend",
-            "leads",
-            "cpl",
-            "action_display",
-        ]
-        display_cols = [c for c in display_cols if c in df_filtered.columns]
-        
-        # Sort by action priority then CPL
-        action_order = {
-            ActionRecommendation.SCALE: 0,
-            ActionRecommendation.MAINTAIN: 1,
-            ActionRecommendation.KILL: 2,
-            ActionRecommendation.NEEDS_DATA: 3,
-        }
-        df_sorted = df_filtered.copy()
-        df_sorted["_action_order"] = df_sorted["action"].map(action_order)
-        df_sorted = df_sorted.sort_values(
-            by=["_action_order", "cpl", "spend"],
+        # Sort by action priority (the categorical's order) then CPL
+        df_sorted = df_filtered.sort_values(
+            by=["action", "cpl", "spend"],
             ascending=[True, True, False],
             na_position="last",
         )
         
-        # Format for display
-        df_display = df_sorted[display_cols].copy()
-        df_display = df_display.rename(columns={
-            "confidence_emoji": "Conf",
-            "ad_name": "Ad Name",
-            "campaign_name": "Campaign",
-            "spend": "Spend",
-            "leads": "Leads",
-            "cpl": "CPL",
-            "action_display": "Action",
-        })
-        
-        # Format numeric columns
-        if "Spend" in df_display.columns:
-            df_display["Spend"] = df_display["Spend"].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "N/A")
-        if "CPL" in df_display.columns:
-            df_display["CPL"] = df_display["CPL"].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "N/A")
-        if "Leads" in df_display.columns:
-            df_display["Leads"] = df_display["Leads"].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
-        
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
-        
-        # Action summary
-        st.markdown("**Quick Summary:**")
-        action_counts = df_sorted["action"].value_counts()
-        cols = st.columns(4)
-        with cols[0]:
-            scale_count = action_counts.get(ActionRecommendation.SCALE, 0)
-            st.success(f"🟢 **SCALE:** {scale_count} ads")
-        with cols[1]:
-            maintain_count = action_counts.get(ActionRecommendation.MAINTAIN, 0)
-            st.info(f"🔵 **MAINTAIN:** {maintain_count} ads")
-        with cols[2]:
-            kill_count = action_counts.get(ActionRecommendation.KILL, 0)
-            st.error(f"🔴 **KILL:** {kill_count} ads")
-        with cols[3]:
-            needs_count = action_counts.get(ActionRecommendation.NEEDS_DATA, 0)
-            st.warning(f"⚪ **NEEDS DATA:** {needs_count} ads")
-        
+        # Each section is a fragment: widgets inside one rerun only that section
+        _render_ranker(df_sorted)
         st.divider()
-        
-        # ============================================
-        # SECTION 2: Statistical Significance
-        # ============================================
-        st.subheader("📈 Statistical Significance")
-        
-        with st.expander("View data requirements for reliable decisions", expanded=False):
-            st.caption(
-                "Each ad needs ~50 leads for 95% confidence that the true CPL is within ±20% of observed CPL. "
-                "Below shows progress toward statistical significance."
-            )
-            
-            # Filter to ads that need more data
-            needs_data_df = df_sorted[df_sorted["action"] == ActionRecommendation.NEEDS_DATA].copy()
-            
-            if needs_data_df.empty:
-                st.success("All ads have sufficient data for reliable decisions!")
-            else:
-                for _, row in needs_data_df.iterrows():
-                    ad_name = row.get("ad_name", "Unknown")
-                    leads_needed = int(row.get("leads_needed", 0))
-                    spend_needed = row.get("spend_needed")
-                    progress = row.get("progress_pct", 0)
-                    current_leads = int(row.get("leads", 0))
-                    
-                    col1, col2 = st.columns([2, 3])
-                    with col1:
-                        st.markdown(f"**{ad_name}**")
-                        st.caption(f"Current: {current_leads} leads")
-                    with col2:
-                        st.progress(min(progress / 100, 1.0))
-                        if spend_needed is not None and spend_needed > 0:
-                            st.caption(f"Need ~{leads_needed} more leads (~${spend_needed:,.0f} more spend)")
-                        else:
-                            st.caption(f"Need ~{leads_needed} more leads")
-        
+        _render_significance(df_sorted)
         st.divider()
-        
-        # ============================================
-        # SECTION 3: LLM Export
-        # ============================================
-        st.subheader("🤖 LLM Analysis Export")
-        st.caption("Generate a formatted export optimized for Claude or ChatGPT analysis.")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            min_spend_export = st.number_input(
-                "Min spend for top/bottom ranking ($)",
-                min_value=0.0,
-                value=250.0,
-                step=50.0,
-                key="export_min_spend",
-            )
-        with col2:
-            top_n = st.number_input(
-                "Number of top/bottom performers",
-                min_value=3,
-                max_value=20,
-                value=5,
-                step=1,
-                key="export_top_n",
-            )
-        
-        # Generate export
-        export_md = generate_llm_export(
-            df_with_confidence,
-            date_since=date_since,
-            date_until=date_until,
-            thresholds=thresholds,
-            min_spend_for_ranking=min_spend_export,
-            top_n=top_n,
-            bottom_n=top_n,
-            include_full_data=True,
-        )
-        
-        # Copy button and preview
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            st.download_button(
-                label="📥 Download as Markdown",
-                data=export_md,
-                file_name="meta_ads_analysis.md",
-                mime="text/markdown",
-            )
-        with col2:
-            if st.button("📋 Copy to Clipboard"):
-                st.code(export_md, language="markdown")
-                st.info("Select all the text above (Cmd+A / Ctrl+A) and copy (Cmd+C / Ctrl+C)")
-        
-        with st.expander("Preview LLM Export", expanded=False):
-            st.markdown(export_md, unsafe_allow_html=True)
+        _render_llm_export(df_with_confidence, date_since, date_until, thresholds.as_tuple())
     
     else:
         st.info("Click **Load/Refresh Data** to fetch ad performance data and begin analysis.")